@@ -1,137 +1,368 @@
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from collections import deque
 from contextlib import asynccontextmanager
+from types import SimpleNamespace
 from typing import Dict, List, Set, Optional
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 import asyncio
-import json
+import hashlib
+import html
+import logging
+import msgpack
+import orjson
+import os
+import queue
 import random
+import time
+
+
+# Log through a queue so the event loop never blocks on a slow stdout;
+# a background thread drains the queue. The listener is started and
+# stopped in lifespan.
+logger = logging.getLogger("steam")
+logger.setLevel(logging.INFO)
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+
+
+# 1-second-granularity timestamp cache: [epoch second, encoded "HH:MM:SS"]
+_ts_cache = [0, b""]
+
+
+def now_hhmmss() -> bytes:
+    """Current wall-clock time as b"HH:MM:SS", memoized per second."""
+    t = int(time.time())
+    cache = _ts_cache
+    if cache[0] != t:
+        lt = time.localtime(t)
+        cache[0] = t
+        cache[1] = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}".encode("ascii")
+    return cache[1]
+
+
+# Pre-encoded turbo-stream fragments. The surrounding HTML is constant,
+# so each message only concatenates the dynamic middle instead of
+# rebuilding (and re-encoding) the whole frame from an f-string. Items
+# are bare <li> elements; the per-stream wrapper is added at flush time
+# so a burst of items can share one frame.
+GREETING_ITEM_PREFIX = b'<li>Hello, '
+GREETING_ITEM_SUFFIX = b'!</li>'
+
+SERVER_PING_ITEM_PREFIX = b'<li style="color: #666; font-style: italic;">'
+
+NOTIFICATION_ITEM_PREFIX = b'<li><strong>'
+ALERT_ITEM_PREFIX = b'<li style="color: #dc3545;"><strong>'
+
+ITEM_SUFFIX = b'</li>'
+TIMESTAMP_SEP = b'</strong>: '
+ITEM_JOINER = b'\n    '
+
+# (frame prefix, frame suffix) per stream, precomputed once
+STREAM_WRAPPERS = {
+    name: (
+        b'\n<turbo-stream action="append" target="' + name.encode("utf-8")
+        + b'">\n  <template>\n    ',
+        b'\n  </template>\n</turbo-stream>',
+    )
+    for name in ("greetings", "notifications", "alerts")
+}
+
+# Scratch buffers for frame assembly, recycled across messages so
+# sustained traffic doesn't allocate a fresh buffer per inbound frame.
+_frame_buffers: deque = deque(bytearray() for _ in range((os.cpu_count() or 1) * 2))
+
+
+def _build_frame(*parts: bytes) -> bytes:
+    """Concatenate frame parts in a pooled scratch buffer."""
+    try:
+        buf = _frame_buffers.popleft()
+    except IndexError:
+        buf = bytearray()
+    try:
+        buf.clear()
+        for part in parts:
+            buf.extend(part)
+        return bytes(buf)
+    finally:
+        _frame_buffers.append(buf)
+
+
+class ClientState:
+    """Per-connection state.
+
+    Carrying the subscription set and liveness stamp on a slotted object
+    turns the per-message bookkeeping into attribute access instead of
+    lookups in module-level dicts keyed by WebSocket.
+    """
+
+    __slots__ = ("websocket", "streams", "last_seen", "uses_msgpack")
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.streams: Set[str] = set()
+        self.last_seen = 0.0
+        self.uses_msgpack = False
 
 
 # Stream subscription management
-# Maps stream names to sets of subscribed WebSocket connections
-stream_subscriptions: Dict[str, Set[WebSocket]] = {}
-# Maps WebSocket connections to their subscribed streams (for cleanup)
-client_streams: Dict[WebSocket, Set[str]] = {}
+# Maps stream names to subscribed clients. A plain list keeps the
+# broadcast loop a tight iteration over a contiguous array; the
+# companion index map gives O(1) membership checks and swap-with-last
+# removal without hashing every subscriber on each broadcast.
+stream_subscriptions: Dict[str, List[ClientState]] = {}
+stream_index: Dict[str, Dict[ClientState, int]] = {}
 
+# All live connections, pinged by the single global heartbeat task
+all_clients: Set[ClientState] = set()
 
-def subscribe_to_stream(websocket: WebSocket, stream_name: str) -> bool:
+# Set while the greetings stream has at least one subscriber, so the
+# periodic broadcaster can sleep instead of polling an empty stream.
+greetings_subscriber_event = asyncio.Event()
+
+
+def subscribe_to_stream(client: ClientState, stream_name: str) -> bool:
     """Subscribe a client to a stream. Returns True if newly subscribed."""
     if stream_name not in stream_subscriptions:
-        stream_subscriptions[stream_name] = set()
+        stream_subscriptions[stream_name] = []
+        stream_index[stream_name] = {}
 
-    if websocket in stream_subscriptions[stream_name]:
+    index = stream_index[stream_name]
+    if client in index:
         return False  # Already subscribed
 
-    stream_subscriptions[stream_name].add(websocket)
+    subs = stream_subscriptions[stream_name]
+    index[client] = len(subs)
+    subs.append(client)
+    client.streams.add(stream_name)
 
-    if websocket not in client_streams:
-        client_streams[websocket] = set()
-    client_streams[websocket].add(stream_name)
+    if stream_name == "greetings" and len(subs) == 1:
+        greetings_subscriber_event.set()
 
-    print(f"Client subscribed to stream: {stream_name} (total: {len(stream_subscriptions[stream_name])})")
+    logger.info("Client subscribed to stream: %s (total: %d)", stream_name, len(subs))
     return True
 
 
-def unsubscribe_from_stream(websocket: WebSocket, stream_name: str) -> bool:
+def unsubscribe_from_stream(client: ClientState, stream_name: str) -> bool:
     """Unsubscribe a client from a stream. Returns True if was subscribed."""
-    if stream_name not in stream_subscriptions:
+    index = stream_index.get(stream_name)
+    if index is None or client not in index:
         return False
 
-    if websocket not in stream_subscriptions[stream_name]:
-        return False
+    # Swap the victim with the last subscriber so removal is O(1).
+    subs = stream_subscriptions[stream_name]
+    pos = index.pop(client)
+    last = subs.pop()
+    if last is not client:
+        subs[pos] = last
+        index[last] = pos
 
-    stream_subscriptions[stream_name].discard(websocket)
+    client.streams.discard(stream_name)
 
-    if websocket in client_streams:
-        client_streams[websocket].discard(stream_name)
-
-    # Clean up empty stream sets
-    if not stream_subscriptions[stream_name]:
+    # Clean up empty streams
+    if not subs:
         del stream_subscriptions[stream_name]
+        del stream_index[stream_name]
+        if stream_name == "greetings":
+            greetings_subscriber_event.clear()
 
-    print(f"Client unsubscribed from stream: {stream_name}")
+    logger.info("Client unsubscribed from stream: %s", stream_name)
     return True
 
 
-def cleanup_client_subscriptions(websocket: WebSocket):
+def cleanup_client_subscriptions(client: ClientState):
     """Remove all subscriptions for a disconnected client."""
-    if websocket not in client_streams:
-        return
-
-    streams = list(client_streams[websocket])
-    for stream_name in streams:
-        unsubscribe_from_stream(websocket, stream_name)
+    for stream_name in list(client.streams):
+        unsubscribe_from_stream(client, stream_name)
 
-    if websocket in client_streams:
-        del client_streams[websocket]
 
+async def broadcast_to_stream(stream_name: str, message: bytes, exclude: Optional[ClientState] = None):
+    """Send a pre-encoded message to clients subscribed to a specific stream.
 
-async def broadcast_to_stream(stream_name: str, message: str, exclude: Optional[WebSocket] = None):
-    """Send message only to clients subscribed to a specific stream."""
+    The payload is identical for every subscriber, so callers encode it
+    once instead of paying a str->bytes conversion per recipient.
+    """
     if stream_name not in stream_subscriptions:
         return
 
-    disconnected = []
-    for client in stream_subscriptions[stream_name]:
-        if client == exclude:
-            continue
-        try:
-            await client.send_text(message)
-        except:
-            disconnected.append(client)
+    # Dispatch to all subscribers concurrently so one slow socket
+    # doesn't stall delivery to everyone else.
+    clients = [c for c in stream_subscriptions[stream_name] if c is not exclude]
+    if not clients:
+        return
+
+    results = await asyncio.gather(
+        *(client.websocket.send_bytes(message) for client in clients),
+        return_exceptions=True,
+    )
 
     # Clean up disconnected clients
-    for client in disconnected:
-        cleanup_client_subscriptions(client)
+    for client, result in zip(clients, results):
+        if isinstance(result, Exception):
+            cleanup_client_subscriptions(client)
+
+
+# Items queued for broadcast, coalesced per stream: a burst of messages
+# arriving in the same event-loop tick flushes as one frame.
+_pending_items: Dict[str, List[bytes]] = {}
+_flush_scheduled: Set[str] = set()
+
+
+def queue_stream_item(stream_name: str, item: bytes):
+    """Queue an <li> fragment and schedule a flush for this tick."""
+    _pending_items.setdefault(stream_name, []).append(item)
+    if stream_name not in _flush_scheduled:
+        _flush_scheduled.add(stream_name)
+        asyncio.get_running_loop().call_soon(_spawn_flush, stream_name)
+
+
+def _spawn_flush(stream_name: str):
+    asyncio.ensure_future(flush_stream(stream_name))
+
+
+async def flush_stream(stream_name: str):
+    """Broadcast all queued items for a stream as a single frame."""
+    _flush_scheduled.discard(stream_name)
+    items = _pending_items.pop(stream_name, None)
+    if not items:
+        return
+
+    prefix, suffix = STREAM_WRAPPERS[stream_name]
+    payload = _build_frame(prefix, ITEM_JOINER.join(items), suffix)
+    await broadcast_to_stream(stream_name, payload)
 
 
 async def periodic_broadcaster():
-    """Send a message to greetings stream subscribers every 5 seconds."""
+    """Send a message to greetings stream subscribers every 5 seconds.
+
+    Blocks on the subscriber event while the stream is empty, so an idle
+    server never wakes up just to find nothing to do.
+    """
     while True:
+        await greetings_subscriber_event.wait()
         await asyncio.sleep(5)
         if "greetings" in stream_subscriptions and stream_subscriptions["greetings"]:
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = now_hhmmss().decode("ascii")
             message = f"Server ping at {timestamp}"
             greetings.append(message)
-            turbo_stream = f"""
-<turbo-stream action="append" target="greetings">
-  <template>
-    <li style="color: #666; font-style: italic;">{message}</li>
-  </template>
-</turbo-stream>"""
-            await broadcast_to_stream("greetings", turbo_stream)
+            item = _build_frame(
+                SERVER_PING_ITEM_PREFIX, message.encode("utf-8"), ITEM_SUFFIX
+            )
+            queue_stream_item("greetings", item)
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    # Start periodic broadcaster on startup
-    task = asyncio.create_task(periodic_broadcaster())
+    # Start log drain, render invariant pages once, start background tasks
+    _log_listener.start()
+    _render_static_pages()
+    tasks = [
+        asyncio.create_task(periodic_broadcaster()),
+        asyncio.create_task(global_heartbeat()),
+    ]
     yield
     # Cancel on shutdown
-    task.cancel()
+    for task in tasks:
+        task.cancel()
+    _log_listener.stop()
 
 
 app = FastAPI(lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
-# Simple in-memory storage for demo
-greetings: List[str] = []
+# Fully-rendered bytes for pages that take no per-request data, keyed by
+# template name. Filled in at startup; serving them skips Jinja entirely.
+STATIC_PAGES = {"about.html": "/about", "frames.html": "/frames"}
+_page_cache: Dict[str, bytes] = {}
+_page_etags: Dict[str, str] = {}
+
+
+def _render_static_pages():
+    """Render each static page once and cache the encoded result.
+
+    base.html only reads request.url.path (to highlight the active nav
+    link), so a minimal stub stands in for the real Request.
+    """
+    for name, path in STATIC_PAGES.items():
+        stub = SimpleNamespace(url=SimpleNamespace(path=path))
+        body = templates.get_template(name).render(request=stub).encode("utf-8")
+        _page_cache[name] = body
+        _page_etags[name] = f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def _static_page_response(name: str, request: Request) -> Response:
+    """Serve a cached page, answering conditional requests with 304."""
+    etag = _page_etags[name]
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return HTMLResponse(
+        _page_cache[name],
+        headers={"ETag": etag, "Cache-Control": "public, max-age=300"},
+    )
+
+# Simple in-memory storage for demo, bounded so long-running servers
+# don't grow (and render) an ever-larger history
+MAX_GREETINGS = 500
+greetings: deque[str] = deque(maxlen=MAX_GREETINGS)
 
 # Configuration
 HEARTBEAT_INTERVAL = 30  # seconds
 RECEIVE_TIMEOUT = 60  # seconds
 
+# Pre-serialized control frames -- the payloads never change, so don't
+# pay a serializer call per heartbeat/pong. Clients may speak JSON or
+# MessagePack; each connection gets replies in whichever it sent.
+PING_FRAME = orjson.dumps({"type": "ping"})
+PONG_FRAME = orjson.dumps({"type": "pong"})
+PING_FRAME_MSGPACK = msgpack.packb({"type": "ping"})
+PONG_FRAME_MSGPACK = msgpack.packb({"type": "pong"})
+
 
-async def heartbeat(websocket: WebSocket):
-    """Send periodic pings to keep connection alive."""
+def _control_reply(client: "ClientState", obj: dict) -> bytes:
+    """Serialize a control reply in the format the client speaks."""
+    return msgpack.packb(obj) if client.uses_msgpack else orjson.dumps(obj)
+
+
+async def global_heartbeat():
+    """Send periodic pings to keep all connections alive.
+
+    One shared timer replaces a heartbeat task per socket, so the idle
+    footprint stays O(1) regardless of connection count.
+    """
+    while True:
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        if all_clients:
+            await asyncio.gather(
+                *(
+                    client.websocket.send_bytes(
+                        PING_FRAME_MSGPACK if client.uses_msgpack else PING_FRAME
+                    )
+                    for client in list(all_clients)
+                ),
+                return_exceptions=True,
+            )
+
+
+async def idle_watchdog(client: ClientState):
+    """Probe connections that have gone silent for RECEIVE_TIMEOUT.
+
+    Wrapping every receive in asyncio.wait_for allocates a Task plus a
+    timer per inbound message; a single background checker per
+    connection keeps the receive loop allocation-free.
+    """
+    loop = asyncio.get_running_loop()
     try:
         while True:
-            await asyncio.sleep(HEARTBEAT_INTERVAL)
-            await websocket.send_text(json.dumps({"type": "ping"}))
+            await asyncio.sleep(RECEIVE_TIMEOUT)
+            if loop.time() - client.last_seen >= RECEIVE_TIMEOUT:
+                # No traffic for a full timeout window; check if still alive
+                await client.websocket.send_bytes(
+                    PING_FRAME_MSGPACK if client.uses_msgpack else PING_FRAME
+                )
     except:
         pass
 
@@ -145,12 +376,12 @@ async def index(request: Request):
 
 @app.get("/about", response_class=HTMLResponse)
 async def about(request: Request):
-    return templates.TemplateResponse("about.html", {"request": request})
+    return _static_page_response("about.html", request)
 
 
 @app.get("/frames", response_class=HTMLResponse)
 async def frames(request: Request):
-    return templates.TemplateResponse("frames.html", {"request": request})
+    return _static_page_response("frames.html", request)
 
 
 @app.get("/streams", response_class=HTMLResponse)
@@ -183,7 +414,7 @@ TAB_CONTENT = {
 @app.get("/frames/tab/{tab_id}", response_class=HTMLResponse)
 async def frames_tab(request: Request, tab_id: int):
     content = TAB_CONTENT.get(tab_id, "Tab not found")
-    timestamp = datetime.now().strftime("%H:%M:%S")
+    timestamp = now_hhmmss().decode("ascii")
     return templates.TemplateResponse("frames/tab.html", {
         "request": request,
         "tab_id": tab_id,
@@ -192,121 +423,170 @@ async def frames_tab(request: Request, tab_id: int):
     })
 
 
+def _format_greeting(timestamp: bytes, content: str) -> bytes:
+    greetings.append(f"Hello, {content}!")
+    return _build_frame(
+        GREETING_ITEM_PREFIX, html.escape(content).encode("utf-8"), GREETING_ITEM_SUFFIX
+    )
+
+
+def _format_notification(timestamp: bytes, content: str) -> bytes:
+    return _build_frame(
+        NOTIFICATION_ITEM_PREFIX, timestamp, TIMESTAMP_SEP,
+        html.escape(content).encode("utf-8"), ITEM_SUFFIX,
+    )
+
+
+def _format_alert(timestamp: bytes, content: str) -> bytes:
+    return _build_frame(
+        ALERT_ITEM_PREFIX, timestamp, TIMESTAMP_SEP,
+        html.escape(content).encode("utf-8"), ITEM_SUFFIX,
+    )
+
+
+STREAM_FORMATTERS = {
+    "greetings": _format_greeting,
+    "notifications": _format_notification,
+    "alerts": _format_alert,
+}
+
+
+async def handle_ping(client: ClientState, msg: dict):
+    await client.websocket.send_bytes(
+        PONG_FRAME_MSGPACK if client.uses_msgpack else PONG_FRAME
+    )
+
+
+async def handle_pong(client: ClientState, msg: dict):
+    pass
+
+
+async def handle_subscribe(client: ClientState, msg: dict):
+    stream_name = msg.get("stream")
+    if stream_name:
+        subscribed = subscribe_to_stream(client, stream_name)
+        await client.websocket.send_bytes(_control_reply(client, {
+            "type": "subscribed",
+            "stream": stream_name,
+            "success": subscribed
+        }))
+
+
+async def handle_unsubscribe(client: ClientState, msg: dict):
+    stream_name = msg.get("stream")
+    if stream_name:
+        unsubscribed = unsubscribe_from_stream(client, stream_name)
+        await client.websocket.send_bytes(_control_reply(client, {
+            "type": "unsubscribed",
+            "stream": stream_name,
+            "success": unsubscribed
+        }))
+
+
+async def handle_message(client: ClientState, msg: dict):
+    """Format a message sent to a specific stream and queue it for broadcast."""
+    stream_name = msg.get("stream")
+    content = msg.get("content", "").strip()
+    if not stream_name or not content:
+        return
+
+    formatter = STREAM_FORMATTERS.get(stream_name)
+    if formatter is None:
+        return
+
+    queue_stream_item(stream_name, formatter(now_hhmmss(), content))
+
+
+# Control-message dispatch table: one dict lookup per inbound frame
+# instead of walking an if/elif chain.
+HANDLERS = {
+    "ping": handle_ping,
+    "pong": handle_pong,
+    "subscribe": handle_subscribe,
+    "unsubscribe": handle_unsubscribe,
+    "message": handle_message,
+}
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
 
-    # Start heartbeat task
-    heartbeat_task = asyncio.create_task(heartbeat(websocket))
+    loop = asyncio.get_running_loop()
+    client = ClientState(websocket)
+    client.last_seen = loop.time()
+    all_clients.add(client)
+
+    # The global heartbeat covers keepalive pings; only the idle
+    # watchdog is per-connection
+    watchdog_task = asyncio.create_task(idle_watchdog(client))
 
     try:
         while True:
-            # Wait for message with timeout
-            try:
-                data = await asyncio.wait_for(
-                    websocket.receive_text(), timeout=RECEIVE_TIMEOUT
-                )
-            except asyncio.TimeoutError:
-                # No message received in timeout period, check if still alive
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            client.last_seen = loop.time()
+
+            # Binary frames carry MessagePack control messages
+            raw = message.get("bytes")
+            if raw is not None:
                 try:
-                    await websocket.send_text(json.dumps({"type": "ping"}))
+                    msg = msgpack.unpackb(raw, raw=False)
+                except (ValueError, msgpack.exceptions.UnpackException):
                     continue
-                except:
-                    break
+                client.uses_msgpack = True
+                handler = HANDLERS.get(msg.get("type"))
+                if handler is not None:
+                    await handler(client, msg)
+                continue
 
-            # Handle JSON messages (ping/pong, subscribe, unsubscribe)
-            try:
-                msg = json.loads(data)
-                msg_type = msg.get("type")
+            data = message.get("text", "")
 
-                if msg_type == "ping":
-                    await websocket.send_text(json.dumps({"type": "pong"}))
-                    continue
-                elif msg_type == "pong":
-                    continue
-                elif msg_type == "subscribe":
-                    stream_name = msg.get("stream")
-                    if stream_name:
-                        subscribed = subscribe_to_stream(websocket, stream_name)
-                        await websocket.send_text(json.dumps({
-                            "type": "subscribed",
-                            "stream": stream_name,
-                            "success": subscribed
-                        }))
-                    continue
-                elif msg_type == "unsubscribe":
-                    stream_name = msg.get("stream")
-                    if stream_name:
-                        unsubscribed = unsubscribe_from_stream(websocket, stream_name)
-                        await websocket.send_text(json.dumps({
-                            "type": "unsubscribed",
-                            "stream": stream_name,
-                            "success": unsubscribed
-                        }))
-                    continue
-                elif msg_type == "message":
-                    # Handle messages sent to a specific stream
-                    stream_name = msg.get("stream")
-                    content = msg.get("content", "").strip()
-                    if stream_name and content:
-                        timestamp = datetime.now().strftime("%H:%M:%S")
-                        if stream_name == "greetings":
-                            greeting = f"Hello, {content}!"
-                            greetings.append(greeting)
-                            turbo_stream = f"""
-<turbo-stream action="append" target="greetings">
-  <template>
-    <li>{greeting}</li>
-  </template>
-</turbo-stream>"""
-                            await broadcast_to_stream("greetings", turbo_stream)
-                        elif stream_name == "notifications":
-                            turbo_stream = f"""
-<turbo-stream action="append" target="notifications">
-  <template>
-    <li><strong>{timestamp}</strong>: {content}</li>
-  </template>
-</turbo-stream>"""
-                            await broadcast_to_stream("notifications", turbo_stream)
-                        elif stream_name == "alerts":
-                            turbo_stream = f"""
-<turbo-stream action="append" target="alerts">
-  <template>
-    <li style="color: #dc3545;"><strong>{timestamp}</strong>: {content}</li>
-  </template>
-</turbo-stream>"""
-                            await broadcast_to_stream("alerts", turbo_stream)
-                    continue
-            except json.JSONDecodeError:
+            # Handle JSON messages (ping/pong, subscribe, unsubscribe, message)
+            try:
+                msg = orjson.loads(data)
+            except orjson.JSONDecodeError:
                 pass  # Not JSON, treat as legacy greeting message
+            else:
+                handler = HANDLERS.get(msg.get("type"))
+                if handler is not None:
+                    await handler(client, msg)
+                    continue
 
             # Handle legacy greeting message (plain text)
             name = data.strip()
             if name:
-                greeting = f"Hello, {name}!"
-                greetings.append(greeting)
-
-                # Broadcast to greetings stream subscribers
-                turbo_stream = f"""
-<turbo-stream action="append" target="greetings">
-  <template>
-    <li>{greeting}</li>
-  </template>
-</turbo-stream>"""
+                greetings.append(f"Hello, {name}!")
 
-                await broadcast_to_stream("greetings", turbo_stream)
+                # Queue for the greetings stream subscribers
+                item = _build_frame(
+                    GREETING_ITEM_PREFIX, html.escape(name).encode("utf-8"), GREETING_ITEM_SUFFIX
+                )
+                queue_stream_item("greetings", item)
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        print(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
     finally:
         # Clean up all subscriptions for this client
-        heartbeat_task.cancel()
-        cleanup_client_subscriptions(websocket)
+        watchdog_task.cancel()
+        all_clients.discard(client)
+        cleanup_client_subscriptions(client)
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Pin the fast implementations instead of relying on autodetection.
+    # Single worker: stream subscriptions live in-process, so broadcasts
+    # can't span workers without an external pub/sub layer.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+    )
@@ -30,6 +30,8 @@ const StreamSubscriptionManager = {
     this.updateStatus("Connecting...", "status")
 
     this.socket = new WebSocket(this.getWsUrl())
+    // Server broadcasts pre-encoded binary frames; avoid Blob round-trips
+    this.socket.binaryType = "arraybuffer"
 
     this.socket.onopen = () => {
       this.updateStatus("Connected", "status connected")
@@ -76,8 +78,11 @@ const StreamSubscriptionManager = {
     }
 
     this.socket.onmessage = (event) => {
+      const data = typeof event.data === "string"
+        ? event.data
+        : new TextDecoder().decode(event.data)
       try {
-        const msg = JSON.parse(event.data)
+        const msg = JSON.parse(data)
         if (msg.type === "ping") {
           this.socket.send(JSON.stringify({ type: "pong" }))
           return
@@ -98,7 +103,7 @@ const StreamSubscriptionManager = {
       }
 
       // Render Turbo Stream message
-      Turbo.renderStreamMessage(event.data)
+      Turbo.renderStreamMessage(data)
     }
   },
 
@@ -1,6 +1,8 @@
 from invoke import task
 import sass
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import os
 
 
 STATIC_DIR = Path(__file__).parent / "static"
@@ -8,36 +10,122 @@ SCSS_DIR = STATIC_DIR / "scss"
 CSS_DIR = STATIC_DIR / "css"
 
 
+def _compile_one(path):
+    """Compile a single SCSS file; runs in a worker process."""
+    css_content = sass.compile(filename=path, output_style="compressed")
+    return Path(path).name, css_content
+
+
 @task
 def scss(c):
-    """Compile SCSS files to CSS."""
+    """Compile SCSS files to CSS, one worker process per file."""
     CSS_DIR.mkdir(parents=True, exist_ok=True)
 
-    for scss_file in SCSS_DIR.glob("*.scss"):
-        if scss_file.name.startswith("_"):
-            continue  # Skip partials
-        css_content = sass.compile(filename=str(scss_file), output_style="compressed")
-        css_file = CSS_DIR / scss_file.with_suffix(".css").name
-        css_file.write_text(css_content)
-        print(f"Compiled {scss_file.name} -> {css_file.name}")
+    # Skip partials
+    sources = [str(p) for p in SCSS_DIR.glob("*.scss") if not p.name.startswith("_")]
+    if not sources:
+        return
+
+    # libsass compilations are independent CPU-bound work, so fan them
+    # out across processes and write the results in the parent.
+    with ProcessPoolExecutor() as pool:
+        for name, css_content in pool.map(_compile_one, sources):
+            css_file = CSS_DIR / Path(name).with_suffix(".css").name
+            css_file.write_text(css_content)
+            print(f"Compiled {name} -> {css_file.name}")
 
 
 @task
 def watch(c):
     """Watch SCSS files and recompile on changes."""
+    try:
+        from watchdog.events import PatternMatchingEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        # No watchdog available on this platform/env; poll instead
+        _watch_polling(c)
+        return
+
+    import time
+
+    class ScssHandler(PatternMatchingEventHandler):
+        # Only react to writes: on_any_event would also fire for the
+        # opened/closed_no_write events that scss(c)'s own reads of the
+        # watched files emit on Linux, recompiling in a loop forever.
+        # One editor save still yields several write events, so collapse
+        # anything inside the debounce window into a single compile.
+        DEBOUNCE_SECONDS = 0.5
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self._last_compile = 0.0
+
+        def _recompile(self, event):
+            if event.is_directory:
+                return
+            now = time.monotonic()
+            if now - self._last_compile < self.DEBOUNCE_SECONDS:
+                return
+            print(f"Change detected in {Path(event.src_path).name}")
+            scss(c)
+            self._last_compile = time.monotonic()
+
+        def on_modified(self, event):
+            self._recompile(event)
+
+        def on_created(self, event):
+            self._recompile(event)
+
+        def on_moved(self, event):
+            self._recompile(event)
+
+    observer = Observer()
+    observer.schedule(ScssHandler(patterns=["*.scss"]), str(SCSS_DIR), recursive=True)
+    observer.start()
+
+    print("Watching for SCSS changes... (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        observer.stop()
+    observer.join()
+
+
+def _scan_scss_mtimes(root):
+    """Collect {path: mtime_ns} for the SCSS tree via os.scandir.
+
+    DirEntry.stat is served from the directory read on most platforms,
+    so a poll tick costs one getdents per directory rather than one
+    stat syscall per file. Nanosecond mtimes avoid float-equality bugs.
+    """
+    mtimes = {}
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".scss"):
+                    mtimes[entry.path] = entry.stat(follow_symlinks=False).st_mtime_ns
+    return mtimes
+
+
+def _watch_polling(c):
+    """Poll SCSS mtimes once a second and recompile on changes."""
     import time
 
     print("Watching for SCSS changes... (Ctrl+C to stop)")
     last_modified = {}
 
     while True:
-        for scss_file in SCSS_DIR.glob("**/*.scss"):
-            mtime = scss_file.stat().st_mtime
-            if scss_file not in last_modified or last_modified[scss_file] != mtime:
-                last_modified[scss_file] = mtime
-                print(f"Change detected in {scss_file.name}")
-                scss(c)
-                break
+        mtimes = _scan_scss_mtimes(SCSS_DIR)
+        if mtimes != last_modified:
+            changed = [p for p, m in mtimes.items() if last_modified.get(p) != m]
+            for path in changed[:1]:
+                print(f"Change detected in {Path(path).name}")
+            last_modified = mtimes
+            scss(c)
         time.sleep(1)
 
 